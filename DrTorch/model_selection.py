@@ -37,12 +37,15 @@
 """
 
 
-from IPython.utils.capture import capture_output
-from contextlib import redirect_stdout
+from contextlib import redirect_stdout, redirect_stderr
+import gc
 import inspect
 from io import StringIO
+import os
+import pickle
+import struct
 
-from .wrappers import Criterion, OptimizerWrapper
+from .wrappers import Criterion, MultiHeadCriterion, OptimizerWrapper
 from .metrics import Metric, SingleHeadMetric, MultiHeadMetric
 from .callbacks import EarlyStopper, MultipleEarlyStoppers
 from .utilities import DataLoaderStrategy
@@ -58,11 +61,167 @@ from tqdm import tqdm
 import itertools
 import time
 
-from typing import Any, Optional, Tuple, List, Dict
+from typing import Any, BinaryIO, Optional, Tuple, List, Dict, Iterator
 
 FIT_PARAMETER_TYPES = torch.utils.data.DataLoader | torch.utils.data.DataLoader | Criterion | list[Metric] | \
                       OptimizerWrapper | int | Optional[EarlyStopper] | bool
 
+SCALAR_TYPES = (int, float, str, bool, np.generic)
+_RECORD_HEADER = struct.Struct('<Q')
+
+
+def _is_plain_value(value: Any) -> bool:
+    """
+    Check whether a hyperparameter value can be compared by value, i.e. it is a scalar or a tuple, list or frozenset
+    of scalars (e.g. the betas of Adam or the sizes of the layers).
+
+    :param value: Hyperparameter value.
+
+    :return: True if the value is a scalar or a collection of scalars.
+
+    """
+
+    if value is None or isinstance(value, SCALAR_TYPES):
+        return True
+    if isinstance(value, (tuple, list, frozenset)):
+        return all(item is None or isinstance(item, SCALAR_TYPES) for item in value)
+    return False
+
+
+def _config_signature(config: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Build a hashable signature of a hyperparameters configuration, used to detect already sampled configurations.
+    Scalars and collections of scalars are kept by value, while any other object (e.g. criteria, optimizers or lists
+    of metrics) is identified by its id, so that no user defined __hash__ or __eq__ is ever evaluated.
+
+    :param config: Dictionary of hyperparameters.
+
+    :return: Tuple of (key, value) pairs sorted by key.
+
+    """
+
+    signature = []
+    for key, value in config.items():
+        if not _is_plain_value(value):
+            value = ('id', id(value))
+        elif isinstance(value, list):
+            value = tuple(value)
+        signature.append((key, value))
+
+    return tuple(sorted(signature))
+
+
+def _saved_hyperparameters_signature(training_hyperparameters: Dict[str, FIT_PARAMETER_TYPES],
+                                     model_hyperparameters: Dict[str, Any],
+                                     hyperparameters_key_to_save: List[str]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Build a signature of the saved hyperparameters of a configuration which is stable across processes, used to
+    check that a resumed search evaluates the same configurations of the interrupted one.
+    Scalars and collections of scalars are kept by value, while any other object is identified by its string
+    representation (e.g. the name of criteria and optimizers).
+
+    :param training_hyperparameters: Dictionary of training hyperparameters of the configuration.
+    :param model_hyperparameters: Dictionary of model hyperparameters of the configuration.
+    :param hyperparameters_key_to_save: List of hyperparameter keys saved in the results dataframe.
+
+    :return: Tuple of (key, value) pairs in the order of hyperparameters_key_to_save.
+
+    """
+
+    total_hyperparameters = {**training_hyperparameters, **model_hyperparameters}
+
+    signature = []
+    for key in hyperparameters_key_to_save:
+        value = total_hyperparameters[key]
+        if not _is_plain_value(value):
+            value = ('str', str(value))
+        elif isinstance(value, list):
+            value = tuple(value)
+        signature.append((key, value))
+
+    return tuple(signature)
+
+
+def _check_resumable_search(path_to_save_search_results: str, resume: bool) -> bool:
+    """
+    Check whether the partial results of an interrupted search exist and may be resumed.
+
+    :param path_to_save_search_results: Path to store the results dataframe.
+    :param resume: If True the partial results of an interrupted search may be resumed.
+
+    :return: True if the partial results exist and have to be resumed.
+
+    :raises FileExistsError: If the partial results exist and resume is False.
+
+    """
+
+    partial_results_path = path_to_save_search_results + '.partial'
+    if os.path.exists(partial_results_path) and not resume:
+        raise FileExistsError(f'{partial_results_path} contains the partial results of an interrupted search. '
+                              f'Pass resume=True to resume it, or remove the file to start a new search.')
+
+    return os.path.exists(partial_results_path)
+
+
+def _move_criterion_to_device(criterion: Criterion | MultiHeadCriterion, device: str) -> None:
+    """
+    Move the tensors held by the loss functions of a criterion (e.g. class weights) to the given device, so that
+    configurations assigned to a different GPU do not mix devices.
+
+    :param criterion: Criterion or MultiHeadCriterion used for the training.
+    :param device: The device on which the model is trained.
+
+    """
+
+    criteria = criterion.loss_functions.values() if isinstance(criterion, MultiHeadCriterion) else [criterion]
+    for current_criterion in criteria:
+        loss_function = getattr(current_criterion, 'loss_function', current_criterion)
+        if isinstance(loss_function, torch.nn.Module):
+            loss_function.to(device)
+
+
+def _warmup_compiled_model(net: torch.nn.Module, data_loader: torch.utils.data.DataLoader) -> None:
+    """
+    Run a single forward pass on a compiled model, so that the compilation cost is not included in the fitting time.
+    RNG states, including the one of the generator used by the data loader to shuffle the data, and module buffers
+    (e.g. batch norm statistics) are restored afterward, hence the warmup does not affect the reproducibility of
+    the following fit.
+
+    :param net: Model compiled with torch.compile.
+    :param data_loader: Data loader used to get a sample batch.
+
+    """
+
+    initial_buffers = {name: buffer.clone() for name, buffer in net.named_buffers()}
+    shuffle_generator = getattr(data_loader, 'generator', None)
+    initial_generator_state = shuffle_generator.get_state() if shuffle_generator is not None else None
+
+    with torch.random.fork_rng():
+        inputs, _ = next(iter(data_loader))
+        net(net._to_device(inputs, net.device))
+
+    if shuffle_generator is not None:
+        shuffle_generator.set_state(initial_generator_state)
+
+    with torch.no_grad():
+        for name, buffer in net.named_buffers():
+            buffer.copy_(initial_buffers[name])
+
+
+def _release_cuda_memory(device: str) -> None:
+    """
+    Collect the unreachable objects and, on CUDA devices, return the cached memory to the driver and reset the peak
+    memory statistics, so that memory left by a configuration does not fragment the memory of the following ones.
+
+    :param device: The device used for the training.
+
+    """
+
+    gc.collect()
+    if torch.device(device).type == 'cuda' and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+        torch.cuda.reset_peak_memory_stats(device)
+
 
 def grid_search_train_validation(
         train_data: Tuple[torch.Tensor, torch.Tensor] | Tuple[pd.DataFrame, pd.DataFrame] | Tuple[pd.Series, pd.Series],
@@ -76,7 +235,10 @@ def grid_search_train_validation(
         path_to_save_grid_search_results: str,
         seeds: Optional[List[int]] = None,
         save_loss_values: bool = False,
-        wandb_params: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        wandb_params: Optional[Dict[str, str]] = None,
+        compile_model: bool = False,
+        n_jobs: int = 1,
+        resume: bool = False) -> pd.DataFrame:
     """
     Perform a grid search train validation over a combination of model and training hyperparameters for a
     deep learning model.
@@ -93,6 +255,15 @@ def grid_search_train_validation(
     :param seeds: List of the seeds for reproducibility of the results of the grid search.
     :param save_loss_values: If True save train and val loss values.
     :param wandb_params: Additional parameters for WandB integration(e.g {'project': project, 'entity': userName}).
+    :param compile_model: If True each model is compiled with torch.compile before fitting. The compilation is
+                          warmed up outside the measured fitting time.
+    :param n_jobs: Number of configurations evaluated in parallel processes. When greater than 1 and device is 'cuda'
+                   without an index, the configurations are assigned round-robin to the available GPUs. The tensors
+                   held by the loss functions of the criterion (e.g. class weights) are moved to the assigned GPU,
+                   while any other tensor in the hyperparameters (e.g. inside custom metrics) must not be bound
+                   to a specific GPU.
+    :param resume: If True and the partial results of an interrupted search with the same results path exist,
+                   the search resumes from them. The configurations must be the same of the interrupted search.
 
     :return: A pandas DataFrame containing the results of the grid search, including hyperparameters and performance metrics.
 
@@ -100,9 +271,9 @@ def grid_search_train_validation(
         #todo example
     """
 
-    iterator = tqdm(
-        iterable=enumerate(itertools.product(training_hyperparameters_to_test, model_hyperparameters_to_test)),
-        total=len(training_hyperparameters_to_test) * len(model_hyperparameters_to_test))
+    configurations = list(itertools.product(training_hyperparameters_to_test, model_hyperparameters_to_test))
+
+    iterator = tqdm(iterable=enumerate(configurations), total=len(configurations))
 
     return collect_results(train_data=train_data,
                            val_data=val_data,
@@ -114,7 +285,10 @@ def grid_search_train_validation(
                            path_to_save_search_results=path_to_save_grid_search_results,
                            seeds=seeds,
                            save_loss_values=save_loss_values,
-                           wandb_params=wandb_params)
+                           wandb_params=wandb_params,
+                           compile_model=compile_model,
+                           n_jobs=n_jobs,
+                           resume=resume)
 
 
 def randomized_search_train_validation(
@@ -130,7 +304,10 @@ def randomized_search_train_validation(
         path_to_save_randomize_search_results: str,
         seeds: Optional[List[int]] = None,
         save_loss_values: bool = False,
-        wandb_params: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        wandb_params: Optional[Dict[str, str]] = None,
+        compile_model: bool = False,
+        n_jobs: int = 1,
+        resume: bool = False) -> pd.DataFrame:
     """
     Perform a randomize search train validation over a combination of model and training hyperparameters for a
     deep learning model.
@@ -148,6 +325,16 @@ def randomized_search_train_validation(
     :param seeds: List of the seeds for reproducibility of the results of the grid search.
     :param save_loss_values: If True save train and val loss values.
     :param wandb_params: Additional parameters for WandB integration(e.g {'project': project, 'entity': userName}).
+    :param compile_model: If True each model is compiled with torch.compile before fitting. The compilation is
+                          warmed up outside the measured fitting time.
+    :param n_jobs: Number of configurations evaluated in parallel processes. When greater than 1 and device is 'cuda'
+                   without an index, the configurations are assigned round-robin to the available GPUs. The tensors
+                   held by the loss functions of the criterion (e.g. class weights) are moved to the assigned GPU,
+                   while any other tensor in the hyperparameters (e.g. inside custom metrics) must not be bound
+                   to a specific GPU.
+    :param resume: If True and the partial results of an interrupted search with the same results path exist,
+                   the search resumes from them, evaluating the configurations sampled by the interrupted search.
+                   These are stored in the results path with the '.configurations' suffix until the search ends.
 
     :return: DataFrame containing the results of the randomized search.
 
@@ -155,8 +342,62 @@ def randomized_search_train_validation(
 
     """
 
+    # The sampled configurations are stored until the search ends, since a resumed search has to evaluate the
+    # same configurations of the interrupted one.
+    configurations_path = path_to_save_randomize_search_results + '.configurations'
+
+    if _check_resumable_search(path_to_save_randomize_search_results, resume):
+        if not os.path.exists(configurations_path):
+            raise FileNotFoundError(f'{configurations_path} not found: the configurations sampled by the interrupted '
+                                    f'search are not available, hence it cannot be resumed.')
+        model_hyperparameters_to_test, training_hyperparameters_to_test = joblib.load(configurations_path)
+    else:
+        model_hyperparameters_to_test, training_hyperparameters_to_test = _sample_configurations(
+            model_hyperparameters_to_sample=model_hyperparameters_to_sample,
+            training_hyperparameters_to_sample=training_hyperparameters_to_sample,
+            n_run=n_run)
+        joblib.dump((model_hyperparameters_to_test, training_hyperparameters_to_test), configurations_path)
+
+    iterator = tqdm(iterable=enumerate(zip(training_hyperparameters_to_test, model_hyperparameters_to_test)),
+                    total=len(training_hyperparameters_to_test))
+
+    df = collect_results(train_data=train_data,
+                         val_data=val_data,
+                         dataloader_builder=dataloader_builder,
+                         iterator=iterator,
+                         shuffle=shuffle,
+                         device=device,
+                         hyperparameters_key_to_save=hyperparameters_key_to_save,
+                         path_to_save_search_results=path_to_save_randomize_search_results,
+                         seeds=seeds,
+                         save_loss_values=save_loss_values,
+                         wandb_params=wandb_params,
+                         compile_model=compile_model,
+                         n_jobs=n_jobs,
+                         resume=resume)
+
+    os.remove(configurations_path)
+
+    return df
+
+
+def _sample_configurations(model_hyperparameters_to_sample: Dict[str, Any],
+                           training_hyperparameters_to_sample: Dict[str, Any],
+                           n_run: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Sample n_run distinct configurations of model and training hyperparameters.
+
+    :param model_hyperparameters_to_sample: Dictionary of model hyperparameter names and functions to sample values.
+    :param training_hyperparameters_to_sample: Dictionary of training hyperparameter names and functions to sample values.
+    :param n_run: Number of configurations to sample.
+
+    :return: Tuple containing the list of model hyperparameters and the list of training hyperparameters.
+
+    """
+
     model_hyperparameters_to_test = []
     training_hyperparameters_to_test = []
+    sampled_configurations = set()
 
     i = 0
 
@@ -168,232 +409,476 @@ def randomized_search_train_validation(
         for key, sampler in training_hyperparameters_to_sample.items():
             training_d[key] = sampler()
 
-        model_hyperparameters_already_present = np.any([model_d == mc for mc in model_hyperparameters_to_test])
-        training_hyperparameters_already_present = np.any([training_d == tc for tc in training_hyperparameters_to_test])
+        configuration_signature = (_config_signature(model_d), _config_signature(training_d))
 
-        if not (model_hyperparameters_already_present and training_hyperparameters_already_present):
+        if configuration_signature not in sampled_configurations:
+            sampled_configurations.add(configuration_signature)
             model_hyperparameters_to_test.append(model_d)
             training_hyperparameters_to_test.append(training_d)
             i += 1
 
-    iterator = tqdm(iterable=enumerate(zip(training_hyperparameters_to_test, model_hyperparameters_to_test)),
-                    total=len(training_hyperparameters_to_test))
-
-    return collect_results(train_data=train_data,
-                           val_data=val_data,
-                           dataloader_builder=dataloader_builder,
-                           iterator=iterator,
-                           shuffle=shuffle,
-                           device=device,
-                           hyperparameters_key_to_save=hyperparameters_key_to_save,
-                           path_to_save_search_results=path_to_save_randomize_search_results,
-                           seeds=seeds,
-                           save_loss_values=save_loss_values,
-                           wandb_params=wandb_params)
+    return model_hyperparameters_to_test, training_hyperparameters_to_test
 
 
-def collect_results(
+def _evaluate_configuration(
+        n_run: int,
+        training_hyperparameters: Dict[str, FIT_PARAMETER_TYPES],
+        model_hyperparameters: Dict[str, Any],
         train_data: Tuple[torch.Tensor, torch.Tensor] | Tuple[pd.DataFrame, pd.DataFrame] | Tuple[pd.Series, pd.Series],
         val_data: Tuple[torch.Tensor, torch.Tensor] | Tuple[pd.DataFrame, pd.DataFrame] | Tuple[pd.Series, pd.Series],
         dataloader_builder: DataLoaderStrategy,
-        iterator: Any,
+        dataloader_params_names: Tuple[str, ...],
+        use_generator: bool,
+        dataloaders_cache: Dict[Tuple, Tuple],
         shuffle: bool,
         device: str,
         hyperparameters_key_to_save: List[str],
-        path_to_save_search_results: str,
         seeds: Optional[List[int]] = None,
         save_loss_values: bool = False,
-        wandb_params: Optional[dict[str, str]] = None) -> pd.DataFrame:
+        wandb_params: Optional[dict[str, str]] = None,
+        compile_model: bool = False) -> Dict[str, Any]:
     """
-    Collects and stores results from multiple runs of a training process.
+    Train and validate a single configuration of hyperparameters once for each seed.
 
+    :param n_run: Index of the configuration, used to name the WandB runs.
+    :param training_hyperparameters: Dictionary of training hyperparameters of the configuration.
+    :param model_hyperparameters: Dictionary of model hyperparameters of the configuration.
     :param train_data: Tuple containing training input and labels tensors or dataframes.
     :param val_data: Tuple containing validation input and labels tensors or dataframes.
-    :param dataloader_builder:  An instance of DataLoaderStrategy for creating data loaders.
-    :param iterator: An iterable representing the range of runs or configurations to be tested.
+    :param dataloader_builder: An instance of DataLoaderStrategy for creating data loaders.
+    :param dataloader_params_names: Names of the parameters of dataloader_builder.create taken from the hyperparameters.
+    :param use_generator: If True dataloader_builder.create accepts a generator used to shuffle the data.
+    :param dataloaders_cache: Data loaders already built, indexed by the signature of their parameters. Loaders are
+                              cached only when all their parameters are scalars or collections of scalars.
     :param shuffle: Boolean indicating whether to shuffle the data during training.
     :param device: The device on which the model should be trained ('cpu' or 'cuda').
     :param hyperparameters_key_to_save: List of hyperparameter keys to save in the results dataframe.
-    :param path_to_save_search_results: Path to store the results dataframe.
     :param seeds: List of seed values for reproducibility.
     :param save_loss_values: If True save train and val loss values.
     :param wandb_params: Additional parameters for WandB integration(e.g {'project': project, 'entity': userName}).
+    :param compile_model: If True the model is compiled with torch.compile before fitting.
 
-    :return: DataFrame containing collected results.
+    :return: Record of the configuration, containing its index ('n_run'), the signature of its saved hyperparameters
+             ('signature') and the rows of the results dataframe, one for each seed ('rows').
 
     """
+
     test_iterator = seeds if seeds is not None else range(1)
+    n_tests = len(test_iterator)
+    synchronize_cuda = torch.device(device).type == 'cuda' and torch.cuda.is_available()
 
     train_input, train_labels = train_data
     val_input, val_labels = val_data
-    dataframe_dict = {key: [] for key in hyperparameters_key_to_save}
-    dataframe_dict['time'] = []
-    dataframe_dict['seed'] = []
-    if save_loss_values:
-        dataframe_dict['train_loss'] = []
-        dataframe_dict['val_loss'] = []
+    rows = []
 
     if wandb_params is not None:
         wandb_flags = ['interaction_with_wandb']
     else:
         wandb_flags = []
 
-    run_idx = 0
+    run_idx = n_run * n_tests
 
-    for n_run, (training_hyperparameters, model_hyperparameters) in iterator:
-        criterion = training_hyperparameters['criterion']
+    criterion = training_hyperparameters['criterion']
+    _move_criterion_to_device(criterion=criterion, device=device)
 
-        early_stopper_exist = 'early_stopper' in training_hyperparameters and training_hyperparameters[
-            'early_stopper'] is not None
+    early_stopper_exist = 'early_stopper' in training_hyperparameters and training_hyperparameters[
+        'early_stopper'] is not None
 
-        train_results = {criterion.name: []}
-        val_results = {criterion.name: []}
+    history_indexes_to_reload = {criterion.name: -1}
 
-        history_indexes_to_reload = {criterion.name: -1}
+    # (curve name, train column, val column) of the curves stored in the results dataframe.
+    curves_columns = [(criterion.name, 'train_loss', 'val_loss')] if save_loss_values else []
 
-        for metric in training_hyperparameters.get('metrics', []):
-            if isinstance(metric, SingleHeadMetric) or metric.aggregate_metrics_function is not None:
-                history_indexes_to_reload[metric.name] = -1
-                train_results[metric.name] = []
-                val_results[metric.name] = []
-            if isinstance(metric, MultiHeadMetric):
-                for current_head_metric in metric.metrics_functions.values():
-                    history_indexes_to_reload[current_head_metric.name] = -1
-                    train_results[current_head_metric.name] = []
-                    val_results[current_head_metric.name] = []
+    for metric in training_hyperparameters.get('metrics', []):
+        if isinstance(metric, SingleHeadMetric) or metric.aggregate_metrics_function is not None:
+            history_indexes_to_reload[metric.name] = -1
+            curves_columns.append((metric.name, metric.name + '_train', metric.name + '_val'))
+        if isinstance(metric, MultiHeadMetric):
+            for current_head_metric in metric.metrics_functions.values():
+                history_indexes_to_reload[current_head_metric.name] = -1
+                curves_columns.append((current_head_metric.name,
+                                       current_head_metric.name + '_train',
+                                       current_head_metric.name + '_val'))
 
-        if wandb_params is not None and not any([flag in training_hyperparameters for flag in wandb_flags]):
-            warning_message = ('Warning: Wandb connection started without logging anything. '
-                               'Maybe you want to add some training hyperparameters wandb related:')
-            print('\n'.join([warning_message] + wandb_flags))
+    # Object arrays, since some metrics (e.g. F1_Score with mode='none') return one value per class.
+    train_results = {curve_name: np.empty(n_tests, dtype=object) for curve_name in history_indexes_to_reload}
+    val_results = {curve_name: np.empty(n_tests, dtype=object) for curve_name in history_indexes_to_reload}
 
-        total_hyperparameters = {**training_hyperparameters, **model_hyperparameters}
+    if wandb_params is not None and not any([flag in training_hyperparameters for flag in wandb_flags]):
+        warning_message = ('Warning: Wandb connection started without logging anything. '
+                           'Maybe you want to add some training hyperparameters wandb related:')
+        print('\n'.join([warning_message] + wandb_flags))
 
-        dataloader_params = [key for key in inspect.signature(dataloader_builder.create).parameters.keys()]
-        dataloader_params = [element for element in dataloader_params if
-                             element not in ['data', 'labels', 'shuffle', 'device']]
-        dataloader_params = {param: total_hyperparameters[
-            param] if param in total_hyperparameters else dataloader_builder.get_dataloader_params(param,total_hyperparameters)
-                             for param in dataloader_params}
+    total_hyperparameters = {**training_hyperparameters, **model_hyperparameters}
 
-        new_training_hyperparameters = training_hyperparameters.copy()
-        new_training_hyperparameters.pop('batch_size')
+    dataloader_params = {param: total_hyperparameters[
+        param] if param in total_hyperparameters else dataloader_builder.get_dataloader_params(param, total_hyperparameters)
+                         for param in dataloader_params_names}
 
-        fitting_times = []
+    # Only parameters compared by value are safe cache keys: ids of objects created on the fly (e.g. a new partial
+    # returned by the dataloader logic) never match again and may be reused by other objects once collected.
+    cacheable = all(_is_plain_value(value) for value in dataloader_params.values())
+    dataloaders_key = _config_signature(dataloader_params) if cacheable else None
 
-        for idx, test_iteration in enumerate(test_iterator):
+    if dataloaders_key is not None and dataloaders_key in dataloaders_cache:
+        train_data_loader, val_data_loader, shuffle_generator = dataloaders_cache[dataloaders_key]
+    else:
+        shuffle_generator = torch.Generator() if use_generator else None
+        generator_param = {'generator': shuffle_generator} if use_generator else {}
 
-            if wandb_params is not None:
-                config_params = {key: total_hyperparameters[key] for key in hyperparameters_key_to_save}
-            else:
-                config_params = {}
+        train_data_loader = dataloader_builder.create(data=train_input,
+                                                      labels=train_labels,
+                                                      shuffle=shuffle,
+                                                      device=device,
+                                                      **generator_param,
+                                                      **dataloader_params)
+
+        val_data_loader = dataloader_builder.create(data=val_input,
+                                                    labels=val_labels,
+                                                    shuffle=False,
+                                                    device=device,
+                                                    **dataloader_params)
 
-            if seeds is not None:
-                torch.manual_seed(test_iteration)
-                np.random.seed(test_iteration)
+        if dataloaders_key is not None:
+            dataloaders_cache[dataloaders_key] = (train_data_loader, val_data_loader, shuffle_generator)
 
-                if wandb_params is not None:
-                    config_params['seed'] = test_iteration
+    new_training_hyperparameters = training_hyperparameters.copy()
+    new_training_hyperparameters.pop('batch_size')
 
-            train_data_loader = dataloader_builder.create(data=train_input,
-                                                          labels=train_labels,
-                                                          shuffle=shuffle,
-                                                          device=device,
-                                                          **dataloader_params)
+    model_class = model_hyperparameters['model_class']
+    new_model_hyperparameters = {key: value for key, value in model_hyperparameters.items() if key != 'model_class'}
 
-            val_data_loader = dataloader_builder.create(data=val_input,
-                                                        labels=val_labels,
-                                                        shuffle=False,
-                                                        device=device,
-                                                        **dataloader_params)
+    fitting_times = np.empty(n_tests, dtype=np.float64)
 
-            new_model_hyperparameters = model_hyperparameters.copy()
-            new_model_hyperparameters.pop('model_class')
+    for idx, test_iteration in enumerate(test_iterator):
 
-            net = model_hyperparameters['model_class'](**new_model_hyperparameters).to(device)
+        if wandb_params is not None:
+            config_params = {key: total_hyperparameters[key] for key in hyperparameters_key_to_save}
+        else:
+            config_params = {}
+
+        if seeds is not None:
+            torch.manual_seed(test_iteration)
+            np.random.seed(test_iteration)
+            if shuffle_generator is not None:
+                shuffle_generator.manual_seed(test_iteration)
 
             if wandb_params is not None:
-                captured_output = StringIO()
-                with capture_output() as _:
-                    with redirect_stdout(captured_output):
-                        wandb.init(config=config_params, name=f'run_{run_idx}', **wandb_params)
-                        wandb.watch(net, total_hyperparameters['criterion'], log="all", log_graph=True)
+                config_params['seed'] = test_iteration
+
+        # Model construction, compile warmup and fit are all guarded, since a configuration too large for the
+        # device usually fails while the model is moved there.
+        net = None
+        try:
+            net = model_class(**new_model_hyperparameters).to(device)
+
+            if compile_model:
+                net.compile(mode='reduce-overhead' if torch.device(device).type == 'cuda' else 'default')
+                _warmup_compiled_model(net=net, data_loader=train_data_loader)
 
-            start_time = time.time()
+            if wandb_params is not None:
+                # wandb prints its banners on stderr and, under IPython, displays the run widget: the silent setting
+                # disables both, unless the user provides its own settings.
+                with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+                    wandb.init(config=config_params,
+                               name=f'run_{run_idx}',
+                               **{'settings': wandb.Settings(silent=True), **wandb_params})
+                    wandb.watch(net, total_hyperparameters['criterion'], log="all", log_graph=True)
+
+            if synchronize_cuda:
+                torch.cuda.synchronize(device)
+            start_time = time.perf_counter()
             result = net.fit(train_loader=train_data_loader,
                              val_loader=val_data_loader,
                              verbose=0,
                              **new_training_hyperparameters)
-            end_time = time.time()
-            fitting_times.append(end_time - start_time)
-
-            if early_stopper_exist:
-                early_stopper = training_hyperparameters['early_stopper']
-                if isinstance(early_stopper, EarlyStopper):
-                    for key in history_indexes_to_reload.keys():
-                        history_indexes_to_reload[key] = early_stopper.history_index_to_reload
-                elif isinstance(early_stopper, MultipleEarlyStoppers):
-                    indexes_for_aggregate_curves = [stopper.history_index_to_reload for stopper in early_stopper.stoppers.values()]
-                    history_indexes_to_reload[criterion.name] = indexes_for_aggregate_curves
-                    for head_name_s, stopper in early_stopper.stoppers.items():
-                        for metric in training_hyperparameters.get('metrics', []):
-                            if metric.aggregate_metrics_function is not None:
-                                history_indexes_to_reload[metric.name] = indexes_for_aggregate_curves
-                            history_indexes_to_reload[
-                                metric.metrics_functions[head_name_s].name] = stopper.history_index_to_reload
-
-            for curve_name, index_to_reload in history_indexes_to_reload.items():
-                if isinstance(index_to_reload, list):
-                    train_values = [result['train'][curve_name][index] for index in index_to_reload]
-                    val_values = [result['val'][curve_name][index] for index in index_to_reload]
-                    train_value = sum(train_values) / len(train_values)
-                    val_value = sum(val_values) / len(val_values)
-                else:
-                    train_value = result['train'][curve_name][index_to_reload]
-                    val_value = result['val'][curve_name][index_to_reload]
-
-                train_results[curve_name].append(train_value)
-                val_results[curve_name].append(val_value)
-
+            if synchronize_cuda:
+                torch.cuda.synchronize(device)
+            end_time = time.perf_counter()
+        except torch.cuda.OutOfMemoryError:
+            result = None
+
+        # The model is released before building the next one, so two models never coexist on the device.
+        del net
+
+        if result is None:
+            print(f'Warning: CUDA out of memory during run_{run_idx}, its results are set to NaN.')
+            _release_cuda_memory(device)
+            fitting_times[idx] = np.nan
+            for curve_name in history_indexes_to_reload:
+                train_results[curve_name][idx] = np.nan
+                val_results[curve_name][idx] = np.nan
             run_idx += 1
+            continue
+
+        fitting_times[idx] = end_time - start_time
+
+        if early_stopper_exist:
+            early_stopper = training_hyperparameters['early_stopper']
+            if isinstance(early_stopper, EarlyStopper):
+                for key in history_indexes_to_reload.keys():
+                    history_indexes_to_reload[key] = early_stopper.history_index_to_reload
+            elif isinstance(early_stopper, MultipleEarlyStoppers):
+                indexes_for_aggregate_curves = [stopper.history_index_to_reload for stopper in early_stopper.stoppers.values()]
+                history_indexes_to_reload[criterion.name] = indexes_for_aggregate_curves
+                for head_name_s, stopper in early_stopper.stoppers.items():
+                    for metric in training_hyperparameters.get('metrics', []):
+                        if metric.aggregate_metrics_function is not None:
+                            history_indexes_to_reload[metric.name] = indexes_for_aggregate_curves
+                        history_indexes_to_reload[
+                            metric.metrics_functions[head_name_s].name] = stopper.history_index_to_reload
+
+        for curve_name, index_to_reload in history_indexes_to_reload.items():
+            if isinstance(index_to_reload, list):
+                train_values = [result['train'][curve_name][index] for index in index_to_reload]
+                val_values = [result['val'][curve_name][index] for index in index_to_reload]
+                train_value = sum(train_values) / len(train_values)
+                val_value = sum(val_values) / len(val_values)
+            else:
+                train_value = result['train'][curve_name][index_to_reload]
+                val_value = result['val'][curve_name][index_to_reload]
 
-        for i, seed in enumerate(seeds):
+            train_results[curve_name][idx] = train_value
+            val_results[curve_name][idx] = val_value
 
-            for key in hyperparameters_key_to_save:
-                dataframe_dict[key].append(total_hyperparameters[key])
+        run_idx += 1
 
-            dataframe_dict['seed'].append(seed)
-            dataframe_dict['time'].append(fitting_times[i])
+    _release_cuda_memory(device)
 
-            if save_loss_values:
-                dataframe_dict['train_loss'].append(train_results[criterion.name][i])
-                dataframe_dict['val_loss'].append(val_results[criterion.name][i])
+    for i, seed in enumerate(test_iterator):
 
-            for metric in training_hyperparameters.get('metrics', []):
+        row = {key: total_hyperparameters[key] for key in hyperparameters_key_to_save}
+        row['time'] = fitting_times[i]
+        row['seed'] = seed
 
-                if isinstance(metric, SingleHeadMetric) or metric.aggregate_metrics_function is not None:
-                    if metric.name + '_train' not in dataframe_dict:
-                        dataframe_dict[metric.name + '_train'] = []
-                    dataframe_dict[metric.name + '_train'].append(train_results[metric.name][i])
+        for curve_name, train_column, val_column in curves_columns:
+            row[train_column] = train_results[curve_name][i]
+            row[val_column] = val_results[curve_name][i]
 
-                    if metric.name + '_val' not in dataframe_dict:
-                        dataframe_dict[metric.name + '_val'] = []
-                    dataframe_dict[metric.name + '_val'].append(val_results[metric.name][i])
+        rows.append(row)
+
+    return {'n_run': n_run,
+            'signature': _saved_hyperparameters_signature(training_hyperparameters=training_hyperparameters,
+                                                          model_hyperparameters=model_hyperparameters,
+                                                          hyperparameters_key_to_save=hyperparameters_key_to_save),
+            'rows': rows}
+
+
+def collect_results(
+        train_data: Tuple[torch.Tensor, torch.Tensor] | Tuple[pd.DataFrame, pd.DataFrame] | Tuple[pd.Series, pd.Series],
+        val_data: Tuple[torch.Tensor, torch.Tensor] | Tuple[pd.DataFrame, pd.DataFrame] | Tuple[pd.Series, pd.Series],
+        dataloader_builder: DataLoaderStrategy,
+        iterator: Any,
+        shuffle: bool,
+        device: str,
+        hyperparameters_key_to_save: List[str],
+        path_to_save_search_results: str,
+        seeds: Optional[List[int]] = None,
+        save_loss_values: bool = False,
+        wandb_params: Optional[dict[str, str]] = None,
+        compile_model: bool = False,
+        n_jobs: int = 1,
+        resume: bool = False) -> pd.DataFrame:
+    """
+    Collects and stores results from multiple runs of a training process.
 
-                if isinstance(metric, MultiHeadMetric):
-                    for current_head_metric in metric.metrics_functions.values():
-                        if current_head_metric.name + '_train' not in dataframe_dict:
-                            dataframe_dict[current_head_metric.name + '_train'] = []
-                        dataframe_dict[current_head_metric.name + '_train'].append(
-                            train_results[current_head_metric.name][i])
+    :param train_data: Tuple containing training input and labels tensors or dataframes.
+    :param val_data: Tuple containing validation input and labels tensors or dataframes.
+    :param dataloader_builder:  An instance of DataLoaderStrategy for creating data loaders.
+    :param iterator: An iterable representing the range of runs or configurations to be tested.
+    :param shuffle: Boolean indicating whether to shuffle the data during training.
+    :param device: The device on which the model should be trained ('cpu' or 'cuda').
+    :param hyperparameters_key_to_save: List of hyperparameter keys to save in the results dataframe.
+    :param path_to_save_search_results: Path to store the results dataframe. While the search is running, the partial
+                                        results are stored in the same path with the '.partial' suffix. If that file
+                                        already exists, the search resumes from it, skipping the configurations
+                                        already evaluated, hence the iterator must yield the same configurations
+                                        in the same order of the interrupted search.
+    :param seeds: List of seed values for reproducibility.
+    :param save_loss_values: If True save train and val loss values.
+    :param wandb_params: Additional parameters for WandB integration(e.g {'project': project, 'entity': userName}).
+    :param compile_model: If True each model is compiled with torch.compile before fitting. The compilation is
+                          warmed up outside the measured fitting time.
+    :param n_jobs: Number of configurations evaluated in parallel processes. When greater than 1 and device is 'cuda'
+                   without an index, the configurations are assigned round-robin to the available GPUs. The tensors
+                   held by the loss functions of the criterion (e.g. class weights) are moved to the assigned GPU,
+                   while any other tensor in the hyperparameters (e.g. inside custom metrics) must not be bound
+                   to a specific GPU.
+    :param resume: If True and the partial results of an interrupted search exist, the search resumes from them,
+                   checking that the iterator yields the same configurations of the interrupted search.
+                   Otherwise, the existence of the partial results raises an error.
 
-                        if current_head_metric.name + '_val' not in dataframe_dict:
-                            dataframe_dict[current_head_metric.name + '_val'] = []
-                        dataframe_dict[current_head_metric.name + '_val'].append(
-                            val_results[current_head_metric.name][i])
+    :return: DataFrame containing collected results.
 
-    df = pd.DataFrame(data=dataframe_dict)
+    """
+    create_params_names = inspect.signature(dataloader_builder.create).parameters
+    dataloader_params_names = tuple(param for param in create_params_names
+                                    if param not in ('data', 'labels', 'shuffle', 'device', 'generator'))
+    use_generator = 'generator' in create_params_names
+
+    evaluation_params = {'train_data': train_data,
+                         'val_data': val_data,
+                         'dataloader_builder': dataloader_builder,
+                         'dataloader_params_names': dataloader_params_names,
+                         'use_generator': use_generator,
+                         'shuffle': shuffle,
+                         'hyperparameters_key_to_save': hyperparameters_key_to_save,
+                         'seeds': seeds,
+                         'save_loss_values': save_loss_values,
+                         'wandb_params': wandb_params,
+                         'compile_model': compile_model}
+
+    # The rows of every configuration are appended to a partial results file as soon as they are available,
+    # so that a crash does not lose the configurations already evaluated. When resuming an interrupted search,
+    # the configurations already evaluated are skipped after checking they are the ones stored in the file.
+    partial_results_path = path_to_save_search_results + '.partial'
+    n_evaluated_configurations = 0
+    iterator = iter(iterator)
+
+    if _check_resumable_search(path_to_save_search_results, resume):
+        for n_run, signature in _check_partial_results(partial_results_path):
+            try:
+                expected_n_run, (training_hyperparameters, model_hyperparameters) = next(iterator)
+            except StopIteration:
+                raise ValueError(f'{partial_results_path} contains more configurations than the ones to evaluate, '
+                                 f'hence it does not belong to this search.')
+            expected_signature = _saved_hyperparameters_signature(
+                training_hyperparameters=training_hyperparameters,
+                model_hyperparameters=model_hyperparameters,
+                hyperparameters_key_to_save=hyperparameters_key_to_save)
+            if n_run != expected_n_run or signature != expected_signature:
+                raise ValueError(f'Configuration {n_run} stored in {partial_results_path} does not match '
+                                 f'configuration {expected_n_run} of this search, hence it cannot be resumed.')
+            n_evaluated_configurations += 1
+
+        print(f'Resuming the search from {partial_results_path}: '
+              f'{n_evaluated_configurations} configurations already evaluated.')
+
+    if n_jobs == 1:
+        # Data loaders depend only on their own parameters, so configurations sharing them (when they are plain
+        # values) reuse the same loaders.
+        # Each cached train loader owns a generator that is reseeded for every seed, hence shuffling is reproducible.
+        dataloaders_cache = {}
+
+        configurations_records = (_evaluate_configuration(n_run=n_run,
+                                                       training_hyperparameters=training_hyperparameters,
+                                                       model_hyperparameters=model_hyperparameters,
+                                                       dataloaders_cache=dataloaders_cache,
+                                                       device=device,
+                                                       **evaluation_params)
+                               for n_run, (training_hyperparameters, model_hyperparameters) in iterator)
+    else:
+        round_robin = torch.device(device).type == 'cuda' and torch.device(device).index is None
+        n_gpus = torch.cuda.device_count() if round_robin else 0
+
+        configurations_records = joblib.Parallel(n_jobs=n_jobs, backend='loky', return_as='generator')(
+            joblib.delayed(_evaluate_configuration)(n_run=n_run,
+                                                    training_hyperparameters=training_hyperparameters,
+                                                    model_hyperparameters=model_hyperparameters,
+                                                    dataloaders_cache={},
+                                                    device=f'cuda:{n_run % n_gpus}' if n_gpus > 1 else device,
+                                                    **evaluation_params)
+            for n_run, (training_hyperparameters, model_hyperparameters) in iterator)
+
+    n_configurations = n_evaluated_configurations
+    with open(partial_results_path, 'ab') as partial_results_file:
+        for configuration_record in configurations_records:
+            record_bytes = pickle.dumps(configuration_record)
+            partial_results_file.write(_RECORD_HEADER.pack(len(record_bytes)) + record_bytes)
+            partial_results_file.flush()
+            n_configurations += 1
+
+    rows = load_partial_results(partial_results_path)
+
+    n_expected_rows = n_configurations * (len(seeds) if seeds is not None else 1)
+    if len(rows) != n_expected_rows:
+        raise RuntimeError(f'{partial_results_path} contains {len(rows)} rows instead of {n_expected_rows}. '
+                           f'The file is kept to allow its inspection.')
+
+    df = pd.DataFrame(data=rows)
 
     joblib.dump(df, path_to_save_search_results)
+    os.remove(partial_results_path)
 
     return df
+
+
+def load_partial_results(partial_results_path: str) -> List[Dict[str, Any]]:
+    """
+    Load the rows stored in a partial results file written by collect_results.
+    The file must be complete: the last record of an interrupted search may be partially written, hence its results
+    are recovered by running the search again with resume=True.
+
+    :param partial_results_path: Path to the partial results file.
+
+    :return: List of rows of the results dataframe.
+
+    :raises EOFError: If the last record of the file is incomplete.
+    :raises pickle.UnpicklingError: If a record of the file is corrupted.
+
+    """
+
+    rows = []
+    with open(partial_results_path, 'rb') as partial_results_file:
+        for record, _ in _read_partial_records(partial_results_file):
+            rows.extend(record['rows'])
+
+    return rows
+
+
+def _check_partial_results(partial_results_path: str) -> List[Tuple[int, Tuple[Tuple[str, Any], ...]]]:
+    """
+    Read the index and the signature of the configurations stored in a partial results file and remove the last
+    record if it was only partially written when the search was interrupted.
+
+    :param partial_results_path: Path to the partial results file.
+
+    :return: List of (n_run, signature) of the configurations completely stored in the file, in order.
+
+    :raises pickle.UnpicklingError: If a completely written record is corrupted.
+
+    """
+
+    configurations = []
+    valid_size = 0
+    with open(partial_results_path, 'r+b') as partial_results_file:
+        try:
+            for record, record_end in _read_partial_records(partial_results_file):
+                configurations.append((record['n_run'], record['signature']))
+                valid_size = record_end
+        except EOFError:
+            pass
+        partial_results_file.truncate(valid_size)
+
+    return configurations
+
+
+def _read_partial_records(partial_results_file: BinaryIO) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """
+    Iterate over the records of a partial results file. Every record is a pickled dictionary preceded by its length,
+    so that a record truncated by an interruption is told apart from a corrupted one.
+
+    :param partial_results_file: Partial results file opened in binary mode.
+
+    :return: Generator of (record, offset of the end of the record).
+
+    :raises EOFError: If the last record of the file is incomplete.
+    :raises pickle.UnpicklingError: If a completely written record is corrupted.
+
+    """
+
+    while True:
+        header = partial_results_file.read(_RECORD_HEADER.size)
+        if not header:
+            break
+        if len(header) < _RECORD_HEADER.size:
+            raise EOFError('The last record of the partial results file is incomplete.')
+        record_size, = _RECORD_HEADER.unpack(header)
+        record_bytes = partial_results_file.read(record_size)
+        if len(record_bytes) < record_size:
+            raise EOFError('The last record of the partial results file is incomplete.')
+        try:
+            record = pickle.loads(record_bytes)
+        except Exception as error:
+            raise pickle.UnpicklingError(f'Corrupted record in the partial results file: {error}') from error
+        yield record, partial_results_file.tell()
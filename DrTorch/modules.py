@@ -52,6 +52,7 @@ import torch
 import numpy as np
 
 from collections import OrderedDict
+from contextlib import nullcontext
 from thop import profile, clever_format
 from IPython.lib.display import IFrame
 
@@ -112,6 +113,8 @@ class DrTorchModule(torch.nn.Module):
 
         Notes:
         - For torch.Tensor objects, the method uses the `to` method to transfer the tensor to the specified device.
+          Copies to an accelerator are non-blocking, so batches coming from pinned memory overlap the transfer with
+          computation, while copies to the CPU are synchronous, so the returned data is always complete.
         - For dictionaries, the method recursively applies itself to each value in the dictionary.
         - For lists, the method recursively applies itself to each element in the list.
         - Other data types are returned unchanged.
@@ -132,7 +135,7 @@ class DrTorchModule(torch.nn.Module):
         """
 
         if isinstance(data, torch.Tensor):
-            return data.to(device)
+            return data.to(device, non_blocking=torch.device(device).type != 'cpu')
         elif isinstance(data, Dict):
             return {key: self._to_device(value, device) for key, value in data.items()}
         elif isinstance(data, List):
@@ -443,6 +446,23 @@ class TrainableModule(DrTorchModule):
 
         return output_data
 
+    @staticmethod
+    def __autocast_context(device_type: str, amp_dtype: Optional[torch.dtype]):
+        """
+        Get the context manager used for the forward passes. torch.autocast is entered only when amp_dtype is given,
+        since some versions of PyTorch reject unsupported device types (e.g. 'mps') even when autocast is disabled.
+
+        :params device_type: Type of the device where the model is stored (e.g. 'cpu' or 'cuda').
+        :params amp_dtype: Dtype used by torch.autocast, or None to disable mixed precision.
+
+        :return: A torch.autocast context if amp_dtype is not None, otherwise a no-op context.
+
+        """
+
+        if amp_dtype is None:
+            return nullcontext()
+        return torch.autocast(device_type=device_type, dtype=amp_dtype)
+
     @staticmethod
     def __merge_batch_predictions(data_list: list[Dict[str, torch.Tensor]] | list[torch.Tensor]) -> (Dict[str, torch.Tensor] |
                                                                                                      torch.Tensor):
@@ -472,7 +492,9 @@ class TrainableModule(DrTorchModule):
                  data_loader: torch.utils.data.DataLoader,
                  criterion: Criterion | MultiHeadCriterion,
                  metrics: Optional[List[Metric | MultiHeadMetric]] = None,
-                 aggregate_loss_on_dataset: bool = True) -> Dict[str, float] | Tuple[Dict[str, float], torch.Tensor]:
+                 aggregate_loss_on_dataset: bool = True,
+                 inference_mode: bool = True,
+                 amp_dtype: Optional[torch.dtype] = None) -> Dict[str, float] | Tuple[Dict[str, float], torch.Tensor]:
 
         """
         Validate the model on the given data loader.
@@ -485,6 +507,10 @@ class TrainableModule(DrTorchModule):
                                           then the partial losses are reduced to get a unique loss for the epoch.
                                           In the first case, the result is more accurate, but more RAM is used.
                                           In the second case, the result is less accurate due to numerical approximation, and less RAM is used.
+        :param inference_mode: If True the validation runs under torch.inference_mode(), which also disables the view and
+                               version tracking of tensors. Otherwise, it runs under torch.no_grad().
+        :param amp_dtype: If not None, the forward pass runs under torch.autocast with the given dtype
+                          (e.g. torch.bfloat16 or torch.float16).
 
         :return: A dictionary containing the validation results, including the loss value and metrics.
                  If `return_predictions` is True, returns a tuple containing the results dictionary and a tensor with
@@ -497,13 +523,15 @@ class TrainableModule(DrTorchModule):
 
         results = {}
         aggregated_losses = torch.tensor([], device='cpu')
+        device_type = torch.device(self.device).type
 
         self.eval()
-        with torch.no_grad():
+        with torch.inference_mode() if inference_mode else torch.no_grad():
             for iteration, (inputs, labels) in enumerate(data_loader):
                 inputs, labels = self._to_device(inputs, self.device), self._to_device(labels, self.device)
-                outputs = self(inputs)
-                loss = criterion(outputs, labels)
+                with TrainableModule.__autocast_context(device_type, amp_dtype):
+                    outputs = self(inputs)
+                    loss = criterion(outputs, labels)
 
                 if aggregate_loss_on_dataset:
                     aggregated_losses = torch.cat((aggregated_losses, loss.to('cpu')))
@@ -539,7 +567,9 @@ class TrainableModule(DrTorchModule):
             aggregate_loss_on_dataset: bool = True,
             verbose: int = 1,
             interaction_with_wandb: bool = False,
-            interaction_function_with_wandb: Optional[Callable] = None) -> Dict[str, Dict[str, List[Any]]]:
+            interaction_function_with_wandb: Optional[Callable] = None,
+            val_inference_mode: bool = True,
+            amp_dtype: Optional[torch.dtype] = None) -> Dict[str, Dict[str, List[Any]]]:
         """
         Train the model.
 
@@ -582,6 +612,11 @@ class TrainableModule(DrTorchModule):
                                                         model.train()
 
                                                         return multimedia_data
+        :param val_inference_mode: If True the evaluation on the train and validation sets at the end of each epoch runs
+                                   under torch.inference_mode(), otherwise under torch.no_grad().
+        :param amp_dtype: If not None, forward passes and losses are computed under torch.autocast with the given dtype
+                          (e.g. torch.bfloat16 or torch.float16). With torch.float16 on CUDA, the gradients are scaled
+                          with a GradScaler to avoid underflows.
 
 
         :returns: A dictionary that contain the history for loss and each metric.
@@ -590,6 +625,9 @@ class TrainableModule(DrTorchModule):
 
         optimizer = optimizer.get_optimizer(self.parameters())
 
+        device_type = torch.device(self.device).type
+        scaler = torch.cuda.amp.GradScaler() if amp_dtype == torch.float16 and device_type == 'cuda' else None
+
         train_history = {criterion.name: []}
         val_history = {criterion.name: []}
 
@@ -625,11 +663,17 @@ class TrainableModule(DrTorchModule):
                 for iteration, (inputs, labels) in enumerate(train_loader):
                     inputs, labels = self._to_device(inputs, self.device), self._to_device(labels, self.device)
                     optimizer.zero_grad()
-                    outputs = self(inputs)
-                    loss = criterion(outputs, labels)
-                    loss = criterion.reduction_function(loss)
-                    loss.backward()
-                    optimizer.step()
+                    with TrainableModule.__autocast_context(device_type, amp_dtype):
+                        outputs = self(inputs)
+                        loss = criterion(outputs, labels)
+                        loss = criterion.reduction_function(loss)
+                    if scaler is not None:
+                        scaler.scale(loss).backward()
+                        scaler.step(optimizer)
+                        scaler.update()
+                    else:
+                        loss.backward()
+                        optimizer.step()
 
                     metrics_value = {}
 
@@ -653,12 +697,16 @@ class TrainableModule(DrTorchModule):
                 train_results = self.validate(data_loader=train_loader,
                                               criterion=criterion,
                                               metrics=metrics,
-                                              aggregate_loss_on_dataset=aggregate_loss_on_dataset)
+                                              aggregate_loss_on_dataset=aggregate_loss_on_dataset,
+                                              inference_mode=val_inference_mode,
+                                              amp_dtype=amp_dtype)
 
                 val_results = self.validate(data_loader=val_loader,
                                             criterion=criterion,
                                             metrics=metrics,
-                                            aggregate_loss_on_dataset=aggregate_loss_on_dataset)
+                                            aggregate_loss_on_dataset=aggregate_loss_on_dataset,
+                                            inference_mode=val_inference_mode,
+                                            amp_dtype=amp_dtype)
 
                 end_time = time.time()
 
@@ -188,6 +188,7 @@ class DataLoaderStrategy(ABC):
                shuffle: bool,
                device: str = 'cpu',
                num_workers: int = 1,
+               generator: Optional[torch.Generator] = None,
                **kwargs: Dict):
         """
         Abstract method to be implemented by subclasses. Defines the strategy for creating a data loader.
@@ -197,6 +198,7 @@ class DataLoaderStrategy(ABC):
         :param shuffle: Flag indicating whether to shuffle the data.
         :param device: Device on which the dataloader will be installed.
         :param num_workers: Number of parallel worker processes to use for loading data.
+        :param generator: Optional generator used to shuffle the data, independent of the global RNG.
         :param kwargs: Additional keyword arguments for configuring the data loader.
 
         :return: Implementation-specific data loader object.
@@ -250,7 +252,8 @@ class DataLoaderFromTensorStrategy(DataLoaderStrategy):
                shuffle: bool,
                device: str = 'cpu',
                num_workers: int = 1,
-               batch_size: int = 32) -> torch.utils.data.DataLoader:
+               batch_size: int = 32,
+               generator: Optional[torch.Generator] = None) -> torch.utils.data.DataLoader:
 
         """
         Create a PyTorch DataLoader instance from input data and labels.
@@ -261,30 +264,201 @@ class DataLoaderFromTensorStrategy(DataLoaderStrategy):
         :param device: Device on which the dataloader will be installed.
         :param num_workers: Number of parallel worker processes to use for loading data.
         :param batch_size: The batch size for the DataLoader. Default is 32.
+        :param generator: Optional generator used to shuffle the data, independent of the global RNG.
 
         :return:  A PyTorch DataLoader instance configured based on the provided parameters.
 
         """
 
         torch_dataset = torch.utils.data.TensorDataset(data, labels)
-        if device == 'cuda' and torch.cuda.is_available():
+        if torch.device(device).type == 'cuda' and torch.cuda.is_available():
             dataloader = torch.utils.data.DataLoader(dataset=torch_dataset,
                                                      batch_size=batch_size,
                                                      shuffle=shuffle,
                                                      pin_memory=True,
-                                                     num_workers=num_workers)
+                                                     num_workers=num_workers,
+                                                     generator=generator)
         else:
-            dataloader = torch.utils.data.DataLoader(dataset=torch_dataset, batch_size=batch_size, shuffle=shuffle)
+            dataloader = torch.utils.data.DataLoader(dataset=torch_dataset,
+                                                     batch_size=batch_size,
+                                                     shuffle=shuffle,
+                                                     generator=generator)
         return dataloader
 
 
+class DeviceTensorDataLoader:
+    """
+    Minimal data loader that iterates over tensors already stored on the target device, slicing them in batches.
+    It avoids workers, memory pinning, collation and host to device copies, hence it is the fastest choice when the
+    whole dataset fits in the device memory.
+
+    Usage:
+    data_loader = DeviceTensorDataLoader(data.to('cuda'), labels.to('cuda'), batch_size=32, shuffle=True)
+    for inputs, labels in data_loader:
+        ...
+    """
+
+    def __init__(self,
+                 data: torch.Tensor,
+                 labels: torch.Tensor,
+                 batch_size: int = 32,
+                 shuffle: bool = False,
+                 generator: Optional[torch.Generator] = None):
+        """
+        Constructor for DeviceTensorDataLoader.
+
+        :param data: The input data tensor, already stored on the target device.
+        :param labels: The tensor containing corresponding labels, stored on the same device of data.
+        :param batch_size: The batch size. Default is 32.
+        :param shuffle: Flag indicating whether to shuffle the data at each new iteration.
+        :param generator: Optional CPU generator used to shuffle the data, independent of the global RNG.
+
+        """
+
+        self.data = data
+        self.labels = labels
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.generator = generator
+
+    def __len__(self) -> int:
+        return (self.data.shape[0] + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        n_element = self.data.shape[0]
+
+        if self.shuffle:
+            permutation = torch.randperm(n_element, generator=self.generator).to(self.data.device)
+            for start in range(0, n_element, self.batch_size):
+                batch_indexes = permutation[start:start + self.batch_size]
+                yield self.data[batch_indexes], self.labels[batch_indexes]
+        else:
+            for start in range(0, n_element, self.batch_size):
+                yield self.data[start:start + self.batch_size], self.labels[start:start + self.batch_size]
+
+
+class DataLoaderFromDeviceTensorStrategy(DataLoaderFromTensorStrategy):
+    """
+    DataLoaderFromDeviceTensorStrategy is a strategy class for creating data loaders from input tensors small enough
+    to be moved once on the target device. Bigger datasets fall back to DataLoaderFromTensorStrategy.
+
+    Usage:
+    strategy = DataLoaderFromDeviceTensorStrategy(max_bytes_on_device=2 ** 30)
+    data_loader = strategy.create(data, labels, shuffle=True, device='cuda', batch_size=32)
+
+    Parameters:
+    - max_bytes_on_device (int, optional): Maximum total size in bytes of the tensors moved on the device by this
+                                           strategy. Default is 1 GiB.
+
+    Note:
+    - Each tensor is moved on a device only once and the copy is shared by all the data loaders created afterward
+      (e.g. with different batch sizes). The copies live as long as the strategy does.
+    """
+
+    def __init__(self,
+                 logic: Callable = None,
+                 max_bytes_on_device: int = 2 ** 30):
+        """
+        Constructor for DataLoaderFromDeviceTensorStrategy.
+
+        :param logic: A callable function or logic used for configuring data loader parameters.
+        :param max_bytes_on_device: Maximum total size in bytes of the tensors moved on the device by this strategy.
+
+        """
+
+        super().__init__(logic=logic)
+        self.max_bytes_on_device = max_bytes_on_device
+        self.bytes_on_device = 0
+        # (id of the source tensor, device) -> (source tensor, device tensor). The source tensor is kept alive,
+        # so its id cannot be reused by another tensor.
+        self.device_tensors = {}
+
+    def __get_device_tensor(self, tensor: torch.Tensor, device: str) -> torch.Tensor:
+        """
+        Get the copy of a tensor on the given device, moving it only the first time.
+
+        :param tensor: The tensor to move.
+        :param device: The target device.
+
+        :return: The tensor stored on the target device.
+
+        """
+
+        key = (id(tensor), str(torch.device(device)))
+        if key not in self.device_tensors:
+            device_tensor = tensor.to(device)
+            self.device_tensors[key] = (tensor, device_tensor)
+            # Only actual copies use device memory, e.g. no copy is made when the tensor is already on the device.
+            if device_tensor is not tensor:
+                self.bytes_on_device += tensor.element_size() * tensor.nelement()
+        return self.device_tensors[key][1]
+
+    @staticmethod
+    def __is_on_device(tensor: torch.Tensor, device: str) -> bool:
+        """
+        Check whether a tensor is already stored on the given device, hence moving it does not make a copy.
+
+        :param tensor: The tensor to check.
+        :param device: The target device.
+
+        :return: True if the tensor is stored on the target device.
+
+        """
+
+        target_device = torch.device(device)
+        return tensor.device.type == target_device.type and (target_device.index is None or
+                                                              tensor.device.index == target_device.index)
+
+    def create(self,
+               data: torch.Tensor,
+               labels: torch.Tensor,
+               shuffle: bool,
+               device: str = 'cpu',
+               batch_size: int = 32,
+               generator: Optional[torch.Generator] = None) -> DeviceTensorDataLoader | torch.utils.data.DataLoader:
+        """
+        Create a DeviceTensorDataLoader on the given device if data and labels are already there or fit in the
+        remaining max_bytes_on_device, otherwise a PyTorch DataLoader.
+
+        :param data: The input data tensor.
+        :param labels: The tensor containing corresponding labels for the input data.
+        :param shuffle: Flag indicating whether to shuffle the data during each epoch.
+        :param device: Device on which the data will be stored.
+        :param batch_size: The batch size. Default is 32.
+        :param generator: Optional CPU generator used to shuffle the data, independent of the global RNG.
+
+        :return: A data loader configured based on the provided parameters.
+
+        """
+
+        device_key = str(torch.device(device))
+        n_new_bytes = sum(tensor.element_size() * tensor.nelement() for tensor in (data, labels)
+                          if (id(tensor), device_key) not in self.device_tensors
+                          and not self.__is_on_device(tensor, device))
+
+        if self.bytes_on_device + n_new_bytes > self.max_bytes_on_device:
+            return super().create(data=data,
+                                  labels=labels,
+                                  shuffle=shuffle,
+                                  device=device,
+                                  batch_size=batch_size,
+                                  generator=generator)
+
+        return DeviceTensorDataLoader(data=self.__get_device_tensor(data, device),
+                                      labels=self.__get_device_tensor(labels, device),
+                                      batch_size=batch_size,
+                                      shuffle=shuffle,
+                                      generator=generator)
+
+
 class DataLoaderFromPipelineStrategy(DataLoaderStrategy):
     """
     DataLoader strategy implementation using a custom data pipeline.
 
     Methods:
     - create(data, labels, shuffle, data_preprocess_f=None, labels_preprocess_f=None, device='cpu',
-             pin_memory=False, num_workers=1, batch_size=32, data_pipeline=None, label_pipeline=None) -> torch.utils.data.DataLoader:
+             pin_memory=False, num_workers=1, batch_size=32, data_pipeline=None, label_pipeline=None,
+             generator=None) -> torch.utils.data.DataLoader:
         Create a DataLoader instance based on the provided data and labels, with optional data and label pipelines.
 
     Attributes:
@@ -302,7 +476,8 @@ class DataLoaderFromPipelineStrategy(DataLoaderStrategy):
                num_workers: int = 1,
                batch_size: int = 32,
                sample_preprocess_f: Optional[Callable] = None,
-               label_preprocess_f: Optional[Callable] = None):
+               label_preprocess_f: Optional[Callable] = None,
+               generator: Optional[torch.Generator] = None):
         """
         Create a DataLoader instance based on the provided data and labels, with optional data and label pipelines.
 
@@ -331,6 +506,7 @@ class DataLoaderFromPipelineStrategy(DataLoaderStrategy):
                                     simultaneously due to memory constraints.
                                     For example, this function could apply a transformation to a single label,
                                     such as categorical encoding.
+        :param generator: Optional generator used to shuffle the data, independent of the global RNG.
 
         Returns:
         :return: torch.utils.data.DataLoader instance based on the provided parameters.
@@ -353,14 +529,18 @@ class DataLoaderFromPipelineStrategy(DataLoaderStrategy):
                           sample_preprocess_f=sample_preprocess_f,
                           label_preprocess_f=label_preprocess_f)
 
-        if device == 'cuda' and torch.cuda.is_available():
+        if torch.device(device).type == 'cuda' and torch.cuda.is_available():
             dataloader = torch.utils.data.DataLoader(dataset=dataset,
                                                      batch_size=batch_size,
                                                      shuffle=shuffle,
                                                      pin_memory=pin_memory,
-                                                     num_workers=num_workers)
+                                                     num_workers=num_workers,
+                                                     generator=generator)
         else:
-            dataloader = torch.utils.data.DataLoader(dataset=dataset, batch_size=batch_size, shuffle=shuffle)
+            dataloader = torch.utils.data.DataLoader(dataset=dataset,
+                                                     batch_size=batch_size,
+                                                     shuffle=shuffle,
+                                                     generator=generator)
 
         return dataloader
 
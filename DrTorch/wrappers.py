@@ -189,6 +189,9 @@ class MultiHeadCriterion(AbstractCriterion):
         self.loss_functions = loss_functions
         self.loss_weights = loss_weights
         self.aggregate_losses_f = aggregate_losses_f
+        # CPU tensor of the loss weights ordered as the heads, built once and moved to the device of the losses.
+        self.weights_tensor = None if loss_weights is None else torch.tensor(
+            [loss_weights[head_key] for head_key in loss_functions.keys()])
 
     def __call__(self,
                  predicted_labels: Dict[str, torch.Tensor],
@@ -204,16 +207,14 @@ class MultiHeadCriterion(AbstractCriterion):
 
         """
 
-        losses = []
-        for head_key, current_head_loss in self.loss_functions.items():
+        losses = torch.stack([current_head_loss(predicted_labels=predicted_labels[head_key],
+                                                target_labels=target_labels[head_key])
+                              for head_key, current_head_loss in self.loss_functions.items()], dim=0)
 
-            losses.append(current_head_loss(predicted_labels=predicted_labels[head_key],
-                                            target_labels=target_labels[head_key]))
+        if self.weights_tensor is not None:
+            weights = self.weights_tensor.to(losses.device, losses.dtype, non_blocking=True)
+            losses = weights.view(-1, *([1] * (losses.dim() - 1))) * losses
 
-        if self.loss_weights is not None:
-            losses = [self.loss_weights[head_key] * current_loss for head_key, current_loss in zip(self.loss_functions.keys(), losses)]
-
-        losses = torch.stack(losses, dim=0)
         loss = self.aggregate_losses_f(losses, dim=0)
 
         return loss
@@ -253,7 +254,7 @@ class OptimizerWrapper:
 
         """
 
-        name = repr(optimizer_constructor).split("'")[1].split('.')[-1]
+        name = optimizer_constructor.__name__
         if identifier:
             name += " " + identifier
         self.name = name